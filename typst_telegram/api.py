@@ -1,3 +1,4 @@
+from concurrent.futures import ProcessPoolExecutor
 from json import dumps
 from pathlib import Path
 from typing import Any
@@ -23,14 +24,18 @@ async def get_render(request: Request):
 
     config: dict[str, Any] = request.app.config
     context = Context(root_dir=config['root_dir'], dpi=config.get('ppi'),
-                      margin=config.get('margin'))
+                      margin=config.get('margin'),
+                      mimetype=config.get('mimetype', 'image/png'),
+                      optimize=config.get('optimize', False),
+                      quality=config.get('quality', 90),
+                      executor=config.get('executor'))
 
     try:
         img = await context.render(expr)
     except RenderingError as e:
         json = dumps(e.to_dict(), ensure_ascii=False)
         raise HTTPBadRequest(body=json, content_type='application/json') from e
-    return Response(body=img)
+    return Response(body=img, content_type=context.mimetype)
 
 
 app = web.Application()
@@ -40,4 +45,12 @@ app.add_routes([web.get('/ping', get_ping), web.get('/render', get_render)])
 def serve(host, port, root_dir: Path = Path('.'),
           render_config: dict[str, Any] = {}, **kwargs):
     app.config = {'root_dir': root_dir, **render_config}
-    web.run_app(app, host=host, port=port)
+    # Image post-processing is CPU-bound so it is offloaded to a process pool
+    # if requested; otherwise, default thread pool of event loop is used.
+    if (jobs := render_config.get('jobs')):
+        app.config['executor'] = ProcessPoolExecutor(jobs)
+    try:
+        web.run_app(app, host=host, port=port)
+    finally:
+        if (executor := app.config.get('executor')) is not None:
+            executor.shutdown()
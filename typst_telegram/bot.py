@@ -1,6 +1,7 @@
 import logging
 from hashlib import md5
 from http import HTTPStatus
+from io import BytesIO
 from os import getenv
 
 from aiogram import Bot, Dispatcher, executor, types
@@ -15,6 +16,10 @@ TELEGRAM_MAX_EDGE_SIZE = 10_000  # width + height
 
 TELEGRAM_MAX_IMAGE_SIZE = 10485760  # 10Mb
 
+# Image formats which are reliably accepted by sendPhoto. Anything else
+# returned by rendering service is sent as a document.
+TELEGRAM_PHOTO_MIMETYPES = ('image/png', 'image/jpeg')
+
 
 GREATINGS = (r'Hi\! I\'m @TypstBot\! I render math expressions written in '
              r'[typst](https://typst.app) markup languge to images\.')
@@ -68,6 +73,7 @@ async def render(message: types.Message):
         async with sess.get('/render', params={'expr': message.text}) as res:
             if res.status == HTTPStatus.OK:
                 img = await res.read()
+                mimetype = res.content_type
             elif res.status == HTTPStatus.BAD_REQUEST:
                 json = await res.json()
                 errors = json['errors']
@@ -88,6 +94,11 @@ async def render(message: types.Message):
     if len(img) > TELEGRAM_MAX_IMAGE_SIZE:
         await message.answer(IMAGE_TOO_LARGE_ERROR, parse_mode='MarkdownV2',
                              disable_web_page_preview=True)
+    elif (mimetype.startswith('image/') and
+          mimetype not in TELEGRAM_PHOTO_MIMETYPES):
+        _, _, ext = mimetype.partition('/')
+        await message.answer_document(
+            types.InputFile(BytesIO(img), filename=f'formula.{ext}'))
     else:
         try:
             await message.answer_photo(img)
@@ -14,6 +14,8 @@ try:
 except ImportError:
     __version__ = None
 
+RENDER_MIMETYPES = ('image/png', 'image/webp', 'image/jpeg')
+
 LOG_LEVELS = {
     'debug': logging.DEBUG,
     'info': logging.INFO,
@@ -69,6 +71,27 @@ class LengthType:
         return value
 
 
+class IntType:
+
+    def __init__(self, min_value: int | None = None,
+                 max_value: int | None = None):
+        self.min_value = min_value
+        self.max_value = max_value
+
+    def __call__(self, value: str) -> int:
+        try:
+            result = int(value)
+        except ValueError:
+            raise ArgumentTypeError(f'integer is expected: {value}')
+        if self.min_value is not None and result < self.min_value:
+            raise ArgumentTypeError(
+                f'value must be at least {self.min_value}: {value}')
+        if self.max_value is not None and result > self.max_value:
+            raise ArgumentTypeError(
+                f'value must be at most {self.max_value}: {value}')
+        return result
+
+
 async def announce(ns: Namespace):
     from typst_telegram.crm import MailingList, announce
     ml = MailingList.from_paths(ns.recipients, ns.output)
@@ -103,9 +126,18 @@ def serve_api(ns: Namespace):
     kwargs.pop('root_dir')
 
     render_config = {}
-    for key in ('ppi', 'margin'):
+    for key in ('ppi', 'margin', 'mimetype', 'optimize', 'quality', 'jobs'):
         render_config[key] = kwargs[f'render_{key}']
 
+    # Image post-processing relies on optional Pillow so we check it in
+    # advance rather than failing on every request.
+    if render_config['optimize'] or render_config['mimetype'] != 'image/png':
+        from typst_telegram.render import Image
+        if Image is None:
+            logging.error('image post-processing requires Pillow: install it '
+                          'with `pip install typst-telegram-bot[optimize]`')
+            return 1
+
     from typst_telegram.api import serve
     return serve(host=kwargs.pop('interface'), port=kwargs.pop('port'),
                  root_dir=root_dir, render_config=render_config, **kwargs)
@@ -211,6 +243,19 @@ g_render.add_argument(
 g_render.add_argument(
     '--render-margin', type=LengthType(), default='0.3em',
     help='space around equation (e.g. 0pt, 0.5em)')
+g_render.add_argument(
+    '--render-mimetype', default='image/png', choices=RENDER_MIMETYPES,
+    help='output image format (requires Pillow for non-PNG formats)')
+g_render.add_argument(
+    '--render-optimize', default=False, action=BooleanOptionalAction,
+    help='recompress and palette-reduce PNG images (requires Pillow)')
+g_render.add_argument(
+    '--render-quality', type=IntType(1, 95), default=90,
+    help='quality of JPEG images (from 1 to 95)')
+g_render.add_argument(
+    '--render-jobs', type=IntType(0), default=0,
+    help='size of process pool for image post-processing (0 means thread '
+         'pool)')
 
 p_serve_bot = p_serve_subparsers.add_parser('bot', help='run telegram bot')
 p_serve_bot.set_defaults(func=serve_bot)
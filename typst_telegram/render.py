@@ -1,14 +1,22 @@
 import logging
 import re
-from asyncio import StreamReader
+from asyncio import StreamReader, get_running_loop
 from asyncio.subprocess import PIPE, create_subprocess_exec
 from codecs import getincrementaldecoder
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from functools import partial
+from io import BytesIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from time import monotonic
 from typing import Any
 
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
 EXPR_TEMPLATE = """\
 #set page(width: auto, height: auto, margin: {margin})
 $ {expr} $
@@ -49,6 +57,58 @@ class DecodingStreamReader:
         return data
 
 
+def reduce_palette(image: 'Image.Image') -> 'Image.Image':
+    """Convert image to palette mode without any loss if it is opaque and
+    has at most 256 distinct colors (which is usually the case for formulas).
+    """
+    if image.mode in ('RGBA', 'LA'):
+        if image.getchannel('A').getextrema() != (255, 255):
+            return image
+        image = image.convert(image.mode[:-1])
+    if image.mode != 'RGB':
+        return image
+    if (colors := image.getcolors(256)) is None:
+        return image
+    # Median cut puts every distinct color to its own box if there are not
+    # more colors than boxes so quantization is exact.
+    return image.quantize(len(colors), method=Image.Quantize.MEDIANCUT,
+                          dither=Image.Dither.NONE)
+
+
+def recompress(data: bytes, mimetype: str = 'image/png',
+               quality: int = 90) -> bytes:
+    """Recompress PNG image produced by typst and, optionally, transcode it
+    to WebP or JPEG. PNG and WebP are encoded losslessly while `quality`
+    applies to JPEG only. Original bytes are returned as is if recompressed
+    PNG turns out to be larger.
+    """
+    if Image is None:
+        raise RuntimeError('Pillow is required for image optimization.')
+
+    with Image.open(BytesIO(data)) as image:
+        image.load()
+        buf = BytesIO()
+        match mimetype:
+            case 'image/png':
+                reduce_palette(image).save(buf, format='PNG', optimize=True)
+            case 'image/webp':
+                image.save(buf, format='WEBP', lossless=True, method=6)
+            case 'image/jpeg':
+                if image.mode in ('RGBA', 'LA', 'P'):
+                    image = image.convert('RGBA')
+                    background = Image.new('RGB', image.size, 'white')
+                    background.paste(image, mask=image.getchannel('A'))
+                    image = background
+                image.convert('RGB').save(buf, format='JPEG', quality=quality,
+                                          optimize=True)
+            case _:
+                raise ValueError(f'unsupported mimetype: {mimetype}')
+
+    if mimetype == 'image/png' and buf.tell() >= len(data):
+        return data
+    return buf.getvalue()
+
+
 @dataclass
 class Context:
 
@@ -60,9 +120,44 @@ class Context:
 
     margin: str = '0.3em'
 
+    # Post-process rendered image (recompress or transcode to `mimetype`). It
+    # is always enabled for mimetypes other than PNG.
+    optimize: bool = False
+
+    quality: int = 90
+
+    # Executor for post-processing stage. Default executor of running loop is
+    # used if nothing is specified.
+    executor: Executor | None = None
+
     async def render(self, expr: str):
         with TemporaryDirectory(dir=self.root_dir) as tmpdir:
-            return await self.render_at(expr, Path(tmpdir))
+            img = await self.render_at(expr, Path(tmpdir))
+        if self.optimize or self.mimetype != 'image/png':
+            img = await self.optimize_image(img)
+        return img
+
+    async def optimize_image(self, img: bytes) -> bytes:
+        loop = get_running_loop()
+        func = partial(recompress, img, self.mimetype, self.quality)
+        started_at = monotonic()
+        try:
+            res = await loop.run_in_executor(self.executor, func)
+        except Exception as e:
+            # Post-processing is optional for PNG so we fall back to original
+            # image. Otherwise, we are unable to return image of requested
+            # type and report it like any other rendering failure.
+            logging.exception('failed to optimize image: mimetype=%s',
+                              self.mimetype)
+            if self.mimetype == 'image/png':
+                return img
+            reason = f'failed to convert image to {self.mimetype}: {e}'
+            raise RenderingError('', '', [{'reason': reason}]) from e
+        elapsed = monotonic() - started_at
+        logging.info('optimize image: mimetype=%s size=%d->%d saved=%d '
+                     'elapsed=%.3fs', self.mimetype, len(img), len(res),
+                     len(img) - len(res), elapsed)
+        return res
 
     async def render_at(self, expr: str, root_dir: Path):
         path_typ = root_dir / 'main.typ'
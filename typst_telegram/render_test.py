@@ -1,4 +1,24 @@
-from typst_telegram.render import Context
+from asyncio import run
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from typst_telegram.render import Context, Image, RenderingError, recompress
+
+requires_pillow = pytest.mark.skipif(Image is None,
+                                     reason='Pillow is not installed')
+
+
+def make_png(mode: str = 'RGBA', size=(64, 16)) -> bytes:
+    image = Image.new(mode, size, 'white')
+    for x in range(size[0]):
+        color = (x * 4, x * 4, x * 4, 255)[:len(mode)]
+        image.putpixel((x, x % size[1]), color)
+    buf = BytesIO()
+    image.save(buf, format='PNG')
+    return buf.getvalue()
 
 
 class TestContext:
@@ -7,3 +27,82 @@ class TestContext:
         """Dummy test for testing CI workflows."""
         context = Context(dpi=ppi)
         assert context.dpi == ppi
+
+    @requires_pillow
+    def test_optimize_image(self):
+        data = make_png()
+        context = Context(optimize=True)
+        assert run(context.optimize_image(data)) == recompress(data)
+
+    @requires_pillow
+    def test_optimize_image_process_pool(self):
+        data = make_png()
+        with ProcessPoolExecutor(1) as executor:
+            context = Context(optimize=True, executor=executor)
+            assert run(context.optimize_image(data)) == recompress(data)
+
+    @requires_pillow
+    def test_optimize_image_fallback(self):
+        data = b'not an image'
+        context = Context(optimize=True)
+        assert run(context.optimize_image(data)) == data
+
+        context = Context(mimetype='image/webp')
+        with pytest.raises(RenderingError):
+            run(context.optimize_image(data))
+
+    def test_render_untouched(self, monkeypatch, tmp_path: Path):
+        data = b'not an image'
+
+        async def render_at(expr: str, root_dir: Path):
+            return data
+
+        context = Context(root_dir=tmp_path, optimize=False)
+        monkeypatch.setattr(context, 'render_at', render_at)
+        assert run(context.render('x')) == data
+
+    @requires_pillow
+    def test_render_transcode(self, monkeypatch, tmp_path: Path):
+        data = make_png()
+
+        async def render_at(expr: str, root_dir: Path):
+            return data
+
+        context = Context(root_dir=tmp_path, mimetype='image/webp')
+        monkeypatch.setattr(context, 'render_at', render_at)
+        with Image.open(BytesIO(run(context.render('x')))) as image:
+            assert image.format == 'WEBP'
+
+
+@requires_pillow
+class TestRecompress:
+
+    def test_png_lossless(self):
+        data = make_png()
+        res = recompress(data)
+        assert len(res) <= len(data)
+        with Image.open(BytesIO(data)) as src, Image.open(BytesIO(res)) as dst:
+            assert dst.mode == 'P'
+            assert src.convert('RGBA').tobytes() == \
+                dst.convert('RGBA').tobytes()
+
+    def test_png_transparent(self):
+        data = make_png()
+        with Image.open(BytesIO(data)) as image:
+            image.putpixel((0, 0), (0, 0, 0, 0))
+            buf = BytesIO()
+            image.save(buf, format='PNG')
+        res = recompress(buf.getvalue())
+        with Image.open(BytesIO(res)) as image:
+            assert image.getpixel((0, 0))[3] == 0
+
+    @pytest.mark.parametrize('mimetype,format', [
+        ('image/webp', 'WEBP'), ('image/jpeg', 'JPEG')])
+    def test_transcode(self, mimetype: str, format: str):
+        res = recompress(make_png(), mimetype)
+        with Image.open(BytesIO(res)) as image:
+            assert image.format == format
+
+    def test_unknown_mimetype(self):
+        with pytest.raises(ValueError):
+            recompress(make_png(), 'image/gif')